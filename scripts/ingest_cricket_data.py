@@ -11,18 +11,38 @@ Or with environment variable:
     python ingest_cricket_data.py --data-dir ./
 """
 
+import io
 import os
 import sys
 import glob
+import json
 import argparse
 import logging
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from datetime import datetime
 from decimal import Decimal
 from typing import Dict, List, Any, Optional, Tuple
 
 import yaml
+try:
+    # libyaml-backed loader is ~6x faster; fall back if PyYAML was built without it
+    from yaml import CSafeLoader as YamlLoader
+except ImportError:
+    from yaml import SafeLoader as YamlLoader
 import psycopg2
-from psycopg2.extras import execute_batch
+from psycopg2.extras import execute_batch, execute_values
+try:
+    # Optional: binary COPY writer (pip install pgcopy); we fall back to text COPY
+    from pgcopy import CopyManager
+except ImportError:
+    CopyManager = None
+try:
+    # Optional: much faster (de)serialization for the rerun parse cache
+    import orjson
+except ImportError:
+    orjson = None
 
 # Configure logging
 logging.basicConfig(
@@ -31,20 +51,23 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Column order for ball_by_ball bulk loads; follows the table's physical
+# (alignment-ordered) layout in schema.sql
+BALL_BY_BALL_COLUMNS = (
+    'match_id', 'innings_number', 'over_number', 'ball_number',
+    'runs_batter', 'runs_extras', 'runs_total',
+    'extras_wides', 'extras_noballs', 'extras_byes', 'extras_legbyes', 'extras_penalty',
+    'is_wicket', 'is_boundary', 'is_four', 'is_six', 'is_dot_ball', 'is_legal_delivery',
+    'batting_team', 'bowling_team', 'striker', 'non_striker', 'bowler',
+    'wicket_type', 'player_dismissed', 'fielder', 'phase'
+)
 
-def get_phase(over_number: int) -> str:
-    """
-    Determine T20 phase based on over number.
-    Powerplay: Overs 0-5 (1-6 in cricket terms)
-    Middle: Overs 6-14 (7-15 in cricket terms)
-    Death: Overs 15-19 (16-20 in cricket terms)
-    """
-    if over_number <= 5:
-        return 'powerplay'
-    elif over_number <= 14:
-        return 'middle'
-    else:
-        return 'death'
+
+# T20 phase by over number, indexed 0-19:
+# Powerplay: Overs 0-5 (1-6 in cricket terms)
+# Middle: Overs 6-14 (7-15 in cricket terms)
+# Death: Overs 15-19 (16-20 in cricket terms)
+PHASES = ('powerplay',) * 6 + ('middle',) * 9 + ('death',) * 5
 
 
 def parse_over_ball(over_ball_key: str) -> Tuple[int, int]:
@@ -52,21 +75,8 @@ def parse_over_ball(over_ball_key: str) -> Tuple[int, int]:
     Parse over.ball format (e.g., '16.3' -> (16, 3))
     Handles edge cases like '0.1', '19.6', etc.
     """
-    parts = str(over_ball_key).split('.')
-    over_num = int(parts[0])
-    ball_num = int(parts[1]) if len(parts) > 1 else 1
-    return over_num, ball_num
-
-
-def safe_get(data: Dict, *keys, default=None):
-    """Safely navigate nested dictionary."""
-    result = data
-    for key in keys:
-        if isinstance(result, dict):
-            result = result.get(key, default)
-        else:
-            return default
-    return result if result is not None else default
+    over_part, _, ball_part = str(over_ball_key).partition('.')
+    return int(over_part), int(ball_part) if ball_part else 1
 
 
 def extract_match_data(yaml_data: Dict, source_file: str) -> Dict:
@@ -89,8 +99,8 @@ def extract_match_data(yaml_data: Dict, source_file: str) -> Dict:
     outcome = info.get('outcome', {})
     winner = outcome.get('winner')
     win_by = outcome.get('by', {})
-    win_by_runs = win_by.get('runs', 0) or 0
-    win_by_wickets = win_by.get('wickets', 0) or 0
+    win_by_runs = win_by.get('runs', 0)
+    win_by_wickets = win_by.get('wickets', 0)
     
     # Determine result type
     result_type = 'normal'
@@ -107,7 +117,9 @@ def extract_match_data(yaml_data: Dict, source_file: str) -> Dict:
     # Player of match (can be list)
     pom = info.get('player_of_match', [])
     player_of_match = pom[0] if pom else None
-    
+
+    toss = info.get('toss') or {}
+
     return {
         'source_file': source_file,
         'match_type': info.get('match_type', 'T20'),
@@ -118,8 +130,8 @@ def extract_match_data(yaml_data: Dict, source_file: str) -> Dict:
         'city': info.get('city'),
         'team1': team1,
         'team2': team2,
-        'toss_winner': safe_get(info, 'toss', 'winner'),
-        'toss_decision': safe_get(info, 'toss', 'decision'),
+        'toss_winner': toss.get('winner'),
+        'toss_decision': toss.get('decision'),
         'winner': winner,
         'win_by_runs': win_by_runs,
         'win_by_wickets': win_by_wickets,
@@ -144,8 +156,12 @@ def extract_players(yaml_data: Dict) -> List[Dict]:
     return players
 
 
-def extract_innings_and_deliveries(yaml_data: Dict, match_id: int, teams: List[str]) -> Tuple[List[Dict], List[Dict]]:
-    """Extract innings and ball-by-ball data from YAML."""
+def extract_innings_and_deliveries(yaml_data: Dict, match_id: Optional[int],
+                                   teams: List[str]) -> Tuple[List[Dict], List[Tuple]]:
+    """
+    Extract innings and ball-by-ball data from YAML.
+    Deliveries are emitted as tuples in BALL_BY_BALL_COLUMNS order.
+    """
     innings_list = yaml_data.get('innings', [])
     
     innings_data = []
@@ -153,7 +169,7 @@ def extract_innings_and_deliveries(yaml_data: Dict, match_id: int, teams: List[s
     
     for idx, innings_entry in enumerate(innings_list):
         # Get innings key (e.g., '1st innings', '2nd innings', 'super over')
-        innings_key = list(innings_entry.keys())[0]
+        innings_key = next(iter(innings_entry))
         innings_info = innings_entry[innings_key]
         
         innings_number = idx + 1
@@ -180,7 +196,7 @@ def extract_innings_and_deliveries(yaml_data: Dict, match_id: int, teams: List[s
         
         for delivery_entry in deliveries:
             # Each delivery is a dict with one key (over.ball)
-            over_ball_key = list(delivery_entry.keys())[0]
+            over_ball_key = next(iter(delivery_entry))
             delivery = delivery_entry[over_ball_key]
             
             over_num, ball_num = parse_over_ball(over_ball_key)
@@ -189,20 +205,20 @@ def extract_innings_and_deliveries(yaml_data: Dict, match_id: int, teams: List[s
             
             # Extract runs
             runs = delivery.get('runs', {})
-            runs_batter = runs.get('batsman', 0) or runs.get('batter', 0) or 0
-            runs_extras = runs.get('extras', 0) or 0
-            runs_total = runs.get('total', 0) or 0
+            runs_batter = runs.get('batsman') or runs.get('batter') or 0
+            runs_extras = runs.get('extras', 0)
+            runs_total = runs.get('total', 0)
             
             total_runs += runs_total
             total_extras += runs_extras
             
             # Extract extras breakdown
             extras = delivery.get('extras', {})
-            extras_wides = extras.get('wides', 0) or 0
-            extras_noballs = extras.get('noballs', 0) or 0
-            extras_byes = extras.get('byes', 0) or 0
-            extras_legbyes = extras.get('legbyes', 0) or 0
-            extras_penalty = extras.get('penalty', 0) or 0
+            extras_wides = extras.get('wides', 0)
+            extras_noballs = extras.get('noballs', 0)
+            extras_byes = extras.get('byes', 0)
+            extras_legbyes = extras.get('legbyes', 0)
+            extras_penalty = extras.get('penalty', 0)
             
             # Determine if legal delivery
             is_legal = extras_wides == 0 and extras_noballs == 0
@@ -239,41 +255,32 @@ def extract_innings_and_deliveries(yaml_data: Dict, match_id: int, teams: List[s
             is_boundary = is_four or is_six
             is_dot_ball = runs_total == 0 and is_legal
             
-            # Get phase
-            phase = get_phase(over_num)
+            # Get phase (anything past over 19 only happens in odd data; call it death)
+            phase = PHASES[over_num] if over_num < 20 else 'death'
             
-            deliveries_data.append({
-                'match_id': match_id,
-                'innings_number': innings_number,
-                'over_number': over_num,
-                'ball_number': ball_num,
-                'batting_team': batting_team,
-                'bowling_team': bowling_team,
-                'striker': delivery.get('batsman') or delivery.get('batter'),
-                'non_striker': delivery.get('non_striker'),
-                'bowler': delivery.get('bowler'),
-                'runs_batter': runs_batter,
-                'runs_extras': runs_extras,
-                'runs_total': runs_total,
-                'extras_wides': extras_wides,
-                'extras_noballs': extras_noballs,
-                'extras_byes': extras_byes,
-                'extras_legbyes': extras_legbyes,
-                'extras_penalty': extras_penalty,
-                'is_wicket': is_wicket,
-                'wicket_type': wicket_type,
-                'player_dismissed': player_dismissed,
-                'fielder': fielder,
-                'is_boundary': is_boundary,
-                'is_four': is_four,
-                'is_six': is_six,
-                'is_dot_ball': is_dot_ball,
-                'is_legal_delivery': is_legal,
-                'phase': phase
-            })
+            # Row tuple in BALL_BY_BALL_COLUMNS order; dicts with 27 string
+            # keys per ball cost far more to build and hold in memory
+            deliveries_data.append((
+                match_id, innings_number, over_num, ball_num,
+                runs_batter, runs_extras, runs_total,
+                extras_wides, extras_noballs, extras_byes, extras_legbyes, extras_penalty,
+                is_wicket, is_boundary, is_four, is_six, is_dot_ball, is_legal,
+                batting_team, bowling_team,
+                delivery.get('batsman') or delivery.get('batter'),
+                delivery.get('non_striker'),
+                delivery.get('bowler'),
+                wicket_type, player_dismissed, fielder, phase
+            ))
         
-        # Calculate total overs (e.g., 19.3)
-        total_overs = float(f"{last_over}.{last_ball}")
+        # Calculate total overs in cricket notation (e.g., 19.3 = 19 overs,
+        # 3 balls); the fractional digits are a ball count, not a decimal.
+        # Cricsheet ball numbers include wides/no-balls and can pass 9 in an
+        # extras-heavy over (e.g. 19.11), where the arithmetic form would
+        # produce an impossible 20.1; keep the string form for that case.
+        if last_ball > 9:
+            total_overs = float(f"{last_over}.{last_ball}")
+        else:
+            total_overs = last_over + last_ball / 10.0
         
         innings_data.append({
             'match_id': match_id,
@@ -290,18 +297,12 @@ def extract_innings_and_deliveries(yaml_data: Dict, match_id: int, teams: List[s
     return innings_data, deliveries_data
 
 
-def insert_match(cursor, match_data: Dict) -> Optional[int]:
-    """Insert match and return match_id. Returns None if already exists."""
-    # Check if already ingested
-    cursor.execute(
-        "SELECT match_id FROM matches WHERE source_file = %s",
-        (match_data['source_file'],)
-    )
-    existing = cursor.fetchone()
-    if existing:
-        logger.info(f"  Skipping {match_data['source_file']} - already ingested")
-        return None
-    
+def insert_match(cursor, match_data: Dict) -> int:
+    """
+    Insert match and return match_id. Duplicate detection happens up front
+    in main (one SELECT for all source_files); the UNIQUE constraint on
+    source_file backstops any race.
+    """
     cursor.execute("""
         INSERT INTO matches (
             source_file, match_type, competition, season, match_date, venue, city,
@@ -319,97 +320,356 @@ def insert_match(cursor, match_data: Dict) -> Optional[int]:
 
 def insert_players(cursor, players: List[Dict]):
     """Insert players (ignore duplicates)."""
-    execute_batch(cursor, """
+    execute_values(cursor, """
         INSERT INTO players (player_name, team)
-        VALUES (%(player_name)s, %(team)s)
+        VALUES %s
         ON CONFLICT (player_name, team) DO NOTHING
-    """, players)
+    """, [(p['player_name'], p['team']) for p in players], page_size=1000)
 
 
 def insert_innings(cursor, innings_data: List[Dict]):
     """Insert innings data."""
-    execute_batch(cursor, """
+    execute_values(cursor, """
         INSERT INTO innings (
             match_id, innings_number, batting_team, bowling_team,
             total_runs, total_wickets, total_overs, total_extras, is_super_over
-        ) VALUES (
-            %(match_id)s, %(innings_number)s, %(batting_team)s, %(bowling_team)s,
-            %(total_runs)s, %(total_wickets)s, %(total_overs)s, %(total_extras)s, %(is_super_over)s
-        )
-    """, innings_data)
-
-
-def insert_deliveries(cursor, deliveries: List[Dict]):
-    """Insert ball-by-ball data in batches."""
-    execute_batch(cursor, """
-        INSERT INTO ball_by_ball (
-            match_id, innings_number, over_number, ball_number,
-            batting_team, bowling_team, striker, non_striker, bowler,
-            runs_batter, runs_extras, runs_total,
-            extras_wides, extras_noballs, extras_byes, extras_legbyes, extras_penalty,
-            is_wicket, wicket_type, player_dismissed, fielder,
-            is_boundary, is_four, is_six, is_dot_ball, is_legal_delivery, phase
-        ) VALUES (
-            %(match_id)s, %(innings_number)s, %(over_number)s, %(ball_number)s,
-            %(batting_team)s, %(bowling_team)s, %(striker)s, %(non_striker)s, %(bowler)s,
-            %(runs_batter)s, %(runs_extras)s, %(runs_total)s,
-            %(extras_wides)s, %(extras_noballs)s, %(extras_byes)s, %(extras_legbyes)s, %(extras_penalty)s,
-            %(is_wicket)s, %(wicket_type)s, %(player_dismissed)s, %(fielder)s,
-            %(is_boundary)s, %(is_four)s, %(is_six)s, %(is_dot_ball)s, %(is_legal_delivery)s, %(phase)s
-        )
-    """, deliveries, page_size=500)
+        ) VALUES %s
+    """, [
+        (i['match_id'], i['innings_number'], i['batting_team'], i['bowling_team'],
+         i['total_runs'], i['total_wickets'], i['total_overs'], i['total_extras'],
+         i['is_super_over'])
+        for i in innings_data
+    ], page_size=1000)
+
+
+def format_copy_field(value) -> str:
+    """Format a Python value as one field of PostgreSQL's COPY text format."""
+    if value is None:
+        return '\\N'
+    if value is True:
+        return 't'
+    if value is False:
+        return 'f'
+    if isinstance(value, str):
+        # Escape the characters COPY text format treats specially
+        return (value.replace('\\', '\\\\')
+                     .replace('\t', '\\t')
+                     .replace('\n', '\\n')
+                     .replace('\r', '\\r'))
+    return str(value)
+
+
+# Lazily built pgcopy managers by target table; construction queries the
+# catalog for column types, so build one per connection rather than per match.
+_copy_managers = {}
+
+
+def insert_deliveries(cursor, deliveries: List[Tuple], table: str = 'ball_by_ball'):
+    """
+    Bulk-load ball-by-ball rows (tuples in BALL_BY_BALL_COLUMNS order) with
+    COPY FROM STDIN (single stream, no per-row INSERTs). Uses PostgreSQL's
+    binary COPY format when pgcopy is installed, which skips int/bool-to-text
+    encoding on our side and reparsing on the server's; otherwise falls back
+    to text-format COPY.
+    """
+    if CopyManager is not None:
+        manager = _copy_managers.get(table)
+        if manager is None:
+            manager = _copy_managers[table] = CopyManager(
+                cursor.connection, table, BALL_BY_BALL_COLUMNS)
+        manager.copy(deliveries)
+        return
+
+    buf = io.StringIO()
+    for delivery in deliveries:
+        buf.write('\t'.join(format_copy_field(field) for field in delivery))
+        buf.write('\n')
+    buf.seek(0)
+    cursor.copy_expert(
+        "COPY {} ({}) FROM STDIN WITH (FORMAT text)".format(table, ', '.join(BALL_BY_BALL_COLUMNS)),
+        buf
+    )
 
 
-def process_yaml_file(cursor, filepath: str) -> bool:
-    """Process a single YAML file. Returns True if successfully ingested."""
+def _iter_innings_entries(loader):
+    """Yield innings entries one at a time from an open YAML event stream."""
+    loader.get_event()  # SequenceStartEvent
+    while not loader.check_event(yaml.SequenceEndEvent):
+        yield loader.construct_object(loader.compose_node(None, None), deep=True)
+    loader.get_event()  # SequenceEndEvent
+
+
+def load_match_streaming(f):
+    """
+    Parse a match file without materializing the full YAML tree. Top-level
+    keys before 'innings' (meta, info) are built eagerly; 'innings' is
+    exposed as a lazy iterator that composes one innings subtree at a time,
+    so peak memory is one innings rather than the whole document plus the
+    extracted rows. Uses the pure-Python loader because libyaml's parser
+    can't mix its event and node APIs. The 'innings' iterator must be
+    consumed before the file is closed.
+    """
+    loader = yaml.SafeLoader(f)
+    loader.get_event()  # StreamStartEvent
+    if loader.check_event(yaml.StreamEndEvent):
+        return None  # empty file
+    loader.get_event()  # DocumentStartEvent
+    if not loader.check_event(yaml.MappingStartEvent):
+        # Not the expected match shape; build the document whole
+        return loader.construct_object(loader.compose_node(None, None), deep=True)
+    loader.get_event()  # MappingStartEvent
+    data = {}
+    while not loader.check_event(yaml.MappingEndEvent):
+        key = loader.construct_object(loader.compose_node(None, None), deep=True)
+        if key == 'innings':
+            # innings is the last (and by far largest) section in Cricsheet
+            # files; hand the rest of the stream to the lazy iterator
+            data['innings'] = _iter_innings_entries(loader)
+            return data
+        data[key] = loader.construct_object(loader.compose_node(None, None), deep=True)
+    return data
+
+
+def _extract_parsed(yaml_data, filename: str):
+    """Run the extractors over a parsed match tree."""
+    match_data = extract_match_data(yaml_data, filename)
+    players = extract_players(yaml_data)
+
+    # Teams for bowling team determination
+    teams = yaml_data.get('info', {}).get('teams', [])
+    innings_data, deliveries_data = extract_innings_and_deliveries(yaml_data, None, teams)
+
+    return match_data, players, innings_data, deliveries_data
+
+
+def parse_yaml_file(filepath: str, low_memory: bool = False, use_cache: bool = True):
+    """
+    Parse and extract a single YAML file. Runs in a worker process, so it
+    returns plain (pickle-friendly) data and never touches the database.
+    Returns (filename, payload, error) where payload is
+    (match_data, players, innings_data, deliveries_data) with match_id
+    unset (filled in by the writer), or None for empty/broken files.
+
+    Cricsheet files rarely change, so the parsed tree is cached as JSON
+    next to each YAML file (invalidated by mtime); JSON loads an order of
+    magnitude faster than YAML on reruns. Dates survive the round trip as
+    ISO strings, which the extractors and the DATE column both accept.
+    """
     filename = os.path.basename(filepath)
-    logger.info(f"Processing: {filename}")
-    
+    cache_path = filepath + '.json'
     try:
+        if use_cache and not low_memory:
+            try:
+                if os.path.getmtime(cache_path) >= os.path.getmtime(filepath):
+                    with open(cache_path, 'rb') as f:
+                        raw = f.read()
+                    yaml_data = orjson.loads(raw) if orjson is not None else json.loads(raw)
+                    if not yaml_data:
+                        return filename, None, 'empty YAML file'
+                    return filename, _extract_parsed(yaml_data, filename), None
+            except (OSError, ValueError):
+                pass  # no cache, or a stale/unreadable one; parse the YAML below
+
         with open(filepath, 'r', encoding='utf-8') as f:
-            yaml_data = yaml.safe_load(f)
-        
-        if not yaml_data:
-            logger.warning(f"  Empty YAML file: {filename}")
-            return False
-        
-        # Extract match data
-        match_data = extract_match_data(yaml_data, filename)
-        
-        # Insert match (returns None if already exists)
-        match_id = insert_match(cursor, match_data)
-        if match_id is None:
-            return False  # Already ingested
-        
-        logger.info(f"  Inserted match_id: {match_id}")
-        
-        # Extract and insert players
-        players = extract_players(yaml_data)
-        insert_players(cursor, players)
-        logger.info(f"  Processed {len(players)} players")
-        
-        # Get teams for bowling team determination
-        teams = yaml_data.get('info', {}).get('teams', [])
-        
-        # Extract innings and deliveries
-        innings_data, deliveries_data = extract_innings_and_deliveries(yaml_data, match_id, teams)
-        
-        # Insert innings
-        insert_innings(cursor, innings_data)
-        logger.info(f"  Inserted {len(innings_data)} innings")
-        
-        # Insert deliveries
-        insert_deliveries(cursor, deliveries_data)
-        logger.info(f"  Inserted {len(deliveries_data)} deliveries")
-        
-        return True
-        
-    except yaml.YAMLError as e:
-        logger.error(f"  YAML parsing error in {filename}: {e}")
-        return False
+            if low_memory:
+                yaml_data = load_match_streaming(f)
+            else:
+                yaml_data = yaml.load(f, Loader=YamlLoader)
+
+            if not yaml_data:
+                return filename, None, 'empty YAML file'
+
+            # Consumes the lazy innings iterator, so stay inside the with-block
+            payload = _extract_parsed(yaml_data, filename)
+
+        if use_cache and not low_memory:
+            try:
+                if orjson is not None:
+                    raw = orjson.dumps(yaml_data, default=str, option=orjson.OPT_NON_STR_KEYS)
+                else:
+                    raw = json.dumps(yaml_data, default=str).encode('utf-8')
+                with open(cache_path, 'wb') as f:
+                    f.write(raw)
+            except OSError:
+                pass  # data dir not writable; caching is best-effort
+
+        return filename, payload, None
     except Exception as e:
-        logger.error(f"  Error processing {filename}: {e}")
-        raise
+        return filename, None, str(e)
+
+
+def prepare_delivery_insert(cursor, table: str = 'ball_by_ball'):
+    """
+    PREPARE the ball-by-ball INSERT server-side so batched EXECUTEs skip
+    per-statement parse/plan. Call once per session, outside the per-file
+    savepoints (a rolled-back PREPARE would be discarded with them).
+    """
+    cols = ', '.join(BALL_BY_BALL_COLUMNS)
+    params = ', '.join(f'${i}' for i in range(1, len(BALL_BY_BALL_COLUMNS) + 1))
+    cursor.execute(f"PREPARE insert_{table} AS INSERT INTO {table} ({cols}) VALUES ({params})")
+
+
+def insert_deliveries_prepared(cursor, deliveries: List[Tuple], table: str = 'ball_by_ball'):
+    """
+    COPY-free fallback for environments where COPY is disallowed: batched
+    EXECUTEs of the statement from prepare_delivery_insert.
+    """
+    placeholders = ', '.join(['%s'] * len(BALL_BY_BALL_COLUMNS))
+    execute_batch(cursor, f"EXECUTE insert_{table} ({placeholders})",
+                  deliveries, page_size=1000)
+
+
+def drop_bulk_load_helpers(cursor):
+    """
+    Drop ball_by_ball's FK constraints and non-PK/unique indexes ahead of a
+    bulk load so COPY doesn't pay per-row B-tree and FK maintenance.
+    Disables autovacuum on the table for the duration.
+
+    The captured DDL is stored in the ball_by_ball_bulk_ddl table inside
+    the same transaction as the drops, so it survives an interrupted run;
+    restore_bulk_load_helpers reads it back from there. DDL saved by an
+    earlier interrupted run is kept and restored alongside this run's.
+    """
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS ball_by_ball_bulk_ddl (
+            name TEXT PRIMARY KEY,              -- index or constraint name
+            kind TEXT NOT NULL,                 -- 'index' or 'constraint'
+            ddl TEXT NOT NULL                   -- statement/definition to recreate it
+        )
+    """)
+    cursor.execute("SELECT COUNT(*) FROM ball_by_ball_bulk_ddl")
+    leftover = cursor.fetchone()[0]
+    if leftover:
+        logger.warning(f"Bulk mode: found DDL for {leftover} objects saved by an "
+                       f"interrupted run; they will be restored after this load")
+
+    cursor.execute("ALTER TABLE ball_by_ball SET (autovacuum_enabled = false)")
+
+    cursor.execute("""
+        SELECT conname, pg_get_constraintdef(oid)
+        FROM pg_constraint
+        WHERE conrelid = 'ball_by_ball'::regclass AND contype = 'f'
+    """)
+    constraints = cursor.fetchall()
+    for name, condef in constraints:
+        cursor.execute("""
+            INSERT INTO ball_by_ball_bulk_ddl (name, kind, ddl)
+            VALUES (%s, 'constraint', %s) ON CONFLICT (name) DO NOTHING
+        """, (name, condef))
+        cursor.execute(f"ALTER TABLE ball_by_ball DROP CONSTRAINT {name}")
+
+    cursor.execute("""
+        SELECT indexname, indexdef
+        FROM pg_indexes
+        WHERE tablename = 'ball_by_ball' AND indexname NOT IN (
+            SELECT conname FROM pg_constraint
+            WHERE conrelid = 'ball_by_ball'::regclass AND contype IN ('p', 'u')
+        )
+    """)
+    indexes = cursor.fetchall()
+    for name, indexdef in indexes:
+        cursor.execute("""
+            INSERT INTO ball_by_ball_bulk_ddl (name, kind, ddl)
+            VALUES (%s, 'index', %s) ON CONFLICT (name) DO NOTHING
+        """, (name, indexdef))
+        cursor.execute(f"DROP INDEX {name}")
+
+    logger.info(f"Bulk mode: dropped {len(indexes)} indexes and "
+                f"{len(constraints)} FK constraints on ball_by_ball")
+
+
+def restore_bulk_load_helpers(cursor):
+    """
+    Recreate everything recorded in ball_by_ball_bulk_ddl (this run's drops
+    plus any left by an interrupted run), then clear the bookkeeping table.
+    """
+    cursor.execute("SELECT name, kind, ddl FROM ball_by_ball_bulk_ddl ORDER BY kind DESC")
+    saved = cursor.fetchall()
+    restored = 0
+    for name, kind, ddl in saved:
+        # Savepoint per object: an already-existing index/constraint (e.g.
+        # recreated by hand after an interrupted run) shouldn't abort the rest
+        cursor.execute("SAVEPOINT restore_ddl")
+        try:
+            if kind == 'index':
+                cursor.execute(ddl)
+            else:
+                # NOT VALID + VALIDATE keeps the ADD itself cheap and takes a
+                # weaker lock during the full-table check
+                cursor.execute(f"ALTER TABLE ball_by_ball ADD CONSTRAINT {name} {ddl} NOT VALID")
+                cursor.execute(f"ALTER TABLE ball_by_ball VALIDATE CONSTRAINT {name}")
+            # Drop the bookkeeping row only once its object exists again
+            cursor.execute("DELETE FROM ball_by_ball_bulk_ddl WHERE name = %s", (name,))
+            cursor.execute("RELEASE SAVEPOINT restore_ddl")
+            restored += 1
+        except psycopg2.Error as e:
+            cursor.execute("ROLLBACK TO SAVEPOINT restore_ddl")
+            logger.warning(f"Bulk mode: could not recreate {kind} {name}: {e}")
+    if restored == len(saved):
+        cursor.execute("DROP TABLE ball_by_ball_bulk_ddl")
+    else:
+        # Keep the remaining DDL so the next --bulk run can retry the restore
+        logger.warning(f"Bulk mode: {len(saved) - restored} objects were not recreated; "
+                       f"their DDL is kept in ball_by_ball_bulk_ddl for the next --bulk run")
+    cursor.execute("ALTER TABLE ball_by_ball RESET (autovacuum_enabled)")
+    logger.info(f"Bulk mode: recreated {restored} of {len(saved)} saved objects on ball_by_ball")
+
+
+def iter_parsed_files(executor, parse_file, yaml_files: List[str], max_in_flight: int):
+    """
+    Submit parse jobs to the pool with at most max_in_flight outstanding and
+    yield results in submission order. executor.map would submit every file
+    up front and buffer completed payloads in their futures whenever the
+    workers outpace the serial DB writer, letting most of the dataset
+    accumulate in memory; the sliding window keeps at most max_in_flight
+    parsed matches alive at once.
+    """
+    files = iter(yaml_files)
+    in_flight = deque()
+    while True:
+        while len(in_flight) < max_in_flight:
+            filepath = next(files, None)
+            if filepath is None:
+                break
+            in_flight.append(executor.submit(parse_file, filepath))
+        if not in_flight:
+            return
+        yield in_flight.popleft().result()
+
+
+def ingest_parsed_match(cursor, filename: str, match_data: Dict, players: List[Dict],
+                        innings_data: List[Dict], deliveries_data: List[Tuple],
+                        seen_players: set, deliveries_table: str = 'ball_by_ball',
+                        use_copy: bool = True):
+    """Write one parsed match to the database."""
+    logger.info(f"Processing: {filename}")
+
+    match_id = insert_match(cursor, match_data)
+    logger.info(f"  Inserted match_id: {match_id}")
+
+    # The same (name, team) pairs recur across a season's matches; only send
+    # the ones this process hasn't inserted yet (ON CONFLICT still backstops)
+    new_players = [p for p in players
+                   if (p['player_name'], p['team']) not in seen_players]
+    if new_players:
+        insert_players(cursor, new_players)
+        seen_players.update((p['player_name'], p['team']) for p in new_players)
+    logger.info(f"  Processed {len(players)} players ({len(new_players)} new)")
+
+    # Workers don't know the match_id; fill it in now (match_id is the
+    # first element of each delivery tuple)
+    for row in innings_data:
+        row['match_id'] = match_id
+    deliveries_data = [(match_id,) + row[1:] for row in deliveries_data]
+
+    insert_innings(cursor, innings_data)
+    logger.info(f"  Inserted {len(innings_data)} innings")
+
+    if use_copy:
+        insert_deliveries(cursor, deliveries_data, deliveries_table)
+    else:
+        insert_deliveries_prepared(cursor, deliveries_data, deliveries_table)
+    logger.info(f"  Inserted {len(deliveries_data)} deliveries")
 
 
 def main():
@@ -423,6 +683,29 @@ def main():
                         help='Path to schema SQL file')
     parser.add_argument('--init-schema', action='store_true',
                         help='Initialize database schema before ingestion')
+    parser.add_argument('--commit-every', type=int, default=50, metavar='N',
+                        help='Commit after every N successfully ingested files (default: 50)')
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), metavar='N',
+                        help='Worker processes for YAML parsing (default: CPU count; 1 disables the pool)')
+    parser.add_argument('--low-memory', action='store_true',
+                        help='Stream YAML innings incrementally instead of loading the whole tree '
+                             '(slower parse, lower peak memory)')
+    parser.add_argument('--bulk', action='store_true',
+                        help='Drop ball_by_ball indexes/FKs during the load and recreate them after; '
+                             'their DDL is saved in the ball_by_ball_bulk_ddl table, so an '
+                             'interrupted run is repaired by the next --bulk run')
+    parser.add_argument('--staging', action='store_true',
+                        help='COPY deliveries into an UNLOGGED staging table (no WAL) and move them '
+                             'into ball_by_ball in one INSERT...SELECT at the end')
+    parser.add_argument('--no-copy', action='store_true',
+                        help='Insert deliveries via a server-side prepared statement instead of COPY '
+                             '(slower; for environments where COPY is disallowed)')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Do not read or write the per-file JSON parse cache')
+    parser.add_argument('--fast-load', action='store_true',
+                        help='Apply bulk-load session settings (synchronous_commit=off, larger '
+                             'work_mem/maintenance_work_mem); a crash can lose the last commits '
+                             'but never corrupts data')
     
     args = parser.parse_args()
     
@@ -446,7 +729,19 @@ def main():
         conn.autocommit = False
         cursor = conn.cursor()
         logger.info("Connected to PostgreSQL database")
-        
+
+        if args.fast_load:
+            # Session-only GUCs from the Postgres bulk-populate guidance:
+            # async commits take fsync off the critical path, bigger memory
+            # settings help sorts and the --bulk index rebuilds
+            cursor.execute(
+                "SET synchronous_commit = off; "
+                "SET work_mem = '64MB'; "
+                "SET maintenance_work_mem = '512MB'; "
+                "SET temp_buffers = '64MB'"
+            )
+            logger.info("Applied fast-load session settings (synchronous_commit=off)")
+
         # Initialize schema if requested
         if args.init_schema:
             schema_path = os.path.join(args.data_dir, args.schema_file)
@@ -464,18 +759,114 @@ def main():
         skip_count = 0
         error_count = 0
         
-        for filepath in yaml_files:
-            try:
-                result = process_yaml_file(cursor, filepath)
-                if result:
+        if args.bulk:
+            drop_bulk_load_helpers(cursor)
+            conn.commit()
+
+        # If an earlier --staging run died after committing matches but before
+        # the end-of-run move, their deliveries exist only in the leftover
+        # stage table and the preflight below would skip those files. Finish
+        # the move (with or without --staging this run) instead of dropping
+        # committed rows.
+        cursor.execute("SELECT to_regclass('ball_by_ball_stage')")
+        if cursor.fetchone()[0] is not None:
+            cols = ', '.join(BALL_BY_BALL_COLUMNS)
+            cursor.execute(
+                f"INSERT INTO ball_by_ball ({cols}) SELECT {cols} FROM ball_by_ball_stage")
+            if cursor.rowcount:
+                logger.warning(f"Recovered {cursor.rowcount} staged deliveries "
+                               f"left by an interrupted run")
+            cursor.execute("DROP TABLE ball_by_ball_stage")
+            conn.commit()
+
+        deliveries_table = 'ball_by_ball'
+        if args.staging:
+            # UNLOGGED skips WAL during the COPY phase; rows are moved into
+            # the real table (and its indexes populated) in one batch below
+            deliveries_table = 'ball_by_ball_stage'
+            cursor.execute(
+                "CREATE UNLOGGED TABLE ball_by_ball_stage (LIKE ball_by_ball INCLUDING DEFAULTS)")
+            conn.commit()
+
+        if args.no_copy:
+            prepare_delivery_insert(cursor, deliveries_table)
+            conn.commit()
+
+        # Preflight: fetch every ingested source_file once and skip those
+        # files up front, before they're even parsed
+        cursor.execute("SELECT source_file FROM matches")
+        already_ingested = {row[0] for row in cursor.fetchall()}
+        if already_ingested:
+            remaining = [fp for fp in yaml_files
+                         if os.path.basename(fp) not in already_ingested]
+            skip_count = len(yaml_files) - len(remaining)
+            if skip_count:
+                logger.info(f"Skipping {skip_count} already-ingested files")
+            yaml_files = remaining
+
+        # Seed the seen-players cache with what's already in the table
+        cursor.execute("SELECT player_name, team FROM players")
+        seen_players = set(cursor.fetchall())
+
+        # Parse/extract in worker processes (CPU-bound, embarrassingly parallel);
+        # DB writes stay serial here since psycopg2 connections aren't shareable.
+        # A bounded window of in-flight futures caps memory when workers
+        # outpace the writer (and keeps --low-memory meaningful).
+        parse_file = partial(parse_yaml_file, low_memory=args.low_memory,
+                             use_cache=not args.no_cache)
+        if args.workers > 1:
+            executor = ProcessPoolExecutor(max_workers=args.workers)
+            parsed_iter = iter_parsed_files(executor, parse_file, yaml_files,
+                                            max_in_flight=args.workers * 4)
+        else:
+            executor = None
+            parsed_iter = map(parse_file, yaml_files)
+
+        # Commit every N files to amortize WAL flushes; a SAVEPOINT per file
+        # keeps one bad file from poisoning the rest of the batch.
+        pending = 0
+        try:
+            for filename, payload, error in parsed_iter:
+                if payload is None:
+                    error_count += 1
+                    logger.error(f"Failed to parse {filename}: {error}")
+                    continue
+                try:
+                    cursor.execute("SAVEPOINT ingest_file")
+                    ingest_parsed_match(cursor, filename, *payload, seen_players,
+                                        deliveries_table, not args.no_copy)
+                    cursor.execute("RELEASE SAVEPOINT ingest_file")
                     success_count += 1
-                    conn.commit()
-                else:
-                    skip_count += 1
-            except Exception as e:
-                error_count += 1
-                conn.rollback()
-                logger.error(f"Rolling back transaction for {filepath}")
+                    pending += 1
+                    if pending >= args.commit_every:
+                        conn.commit()
+                        pending = 0
+                except Exception as e:
+                    error_count += 1
+                    cursor.execute("ROLLBACK TO SAVEPOINT ingest_file")
+                    logger.error(f"Rolling back changes for {filename}: {e}")
+                    # The rollback may have discarded players already added to
+                    # the cache; reseed it from the table
+                    cursor.execute("SELECT player_name, team FROM players")
+                    seen_players = set(cursor.fetchall())
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+        if pending:
+            conn.commit()
+
+        if args.staging:
+            cols = ', '.join(BALL_BY_BALL_COLUMNS)
+            logger.info("Moving staged deliveries into ball_by_ball...")
+            cursor.execute(
+                f"INSERT INTO ball_by_ball ({cols}) SELECT {cols} FROM ball_by_ball_stage")
+            cursor.execute("DROP TABLE ball_by_ball_stage")
+            conn.commit()
+
+        if args.bulk:
+            restore_bulk_load_helpers(cursor)
+            conn.commit()
         
         # Final summary
         logger.info("=" * 50)
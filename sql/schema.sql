@@ -51,13 +51,13 @@ CREATE INDEX idx_matches_toss_winner ON matches(toss_winner);
 CREATE TABLE innings (
     innings_id SERIAL PRIMARY KEY,
     match_id INT NOT NULL REFERENCES matches(match_id) ON DELETE CASCADE,
-    innings_number INT NOT NULL,                -- 1, 2, 3 (super over), 4 (super over)
+    innings_number SMALLINT NOT NULL,           -- 1, 2, 3 (super over), 4 (super over)
     batting_team TEXT NOT NULL,                 -- Team batting in this innings
     bowling_team TEXT NOT NULL,                 -- Team bowling in this innings
-    total_runs INT DEFAULT 0,                   -- Total runs scored
-    total_wickets INT DEFAULT 0,                -- Total wickets lost
+    total_runs SMALLINT DEFAULT 0,              -- Total runs scored
+    total_wickets SMALLINT DEFAULT 0,           -- Total wickets lost
     total_overs DECIMAL(4,1) DEFAULT 0,         -- Overs faced (e.g., 19.3)
-    total_extras INT DEFAULT 0,                 -- Total extras conceded
+    total_extras SMALLINT DEFAULT 0,            -- Total extras conceded
     is_super_over BOOLEAN DEFAULT FALSE,        -- True if this is a super over
     UNIQUE(match_id, innings_number)
 );
@@ -70,47 +70,52 @@ CREATE INDEX idx_innings_bowling_team ON innings(bowling_team);
 -- TABLE 3: ball_by_ball
 -- Stores every delivery. This is the core analytics table.
 -- ============================================================================
+-- Columns are ordered by descending alignment (8-byte, then 4-byte ints,
+-- then 2-byte smallints, then booleans, then variable-length text) to
+-- minimize per-row padding; with millions of rows the savings compound
+-- across heap, WAL and COPY.
 CREATE TABLE ball_by_ball (
     ball_id SERIAL PRIMARY KEY,
     match_id INT NOT NULL REFERENCES matches(match_id) ON DELETE CASCADE,
-    innings_number INT NOT NULL,                -- 1, 2, 3, 4
-    over_number INT NOT NULL,                   -- 0-19 for T20 (0-indexed)
-    ball_number INT NOT NULL,                   -- Ball within the over (1-6+)
-    batting_team TEXT NOT NULL,                 -- Team batting
-    bowling_team TEXT NOT NULL,                 -- Team bowling
-    striker TEXT NOT NULL,                      -- Batter facing the ball
-    non_striker TEXT NOT NULL,                  -- Batter at non-striker end
-    bowler TEXT NOT NULL,                       -- Bowler delivering
-    
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    innings_number SMALLINT NOT NULL,           -- 1, 2, 3, 4
+    over_number SMALLINT NOT NULL,              -- 0-19 for T20 (0-indexed)
+    ball_number SMALLINT NOT NULL,              -- Ball within the over (1-6+)
+
     -- Runs breakdown
-    runs_batter INT DEFAULT 0,                  -- Runs scored by batter
-    runs_extras INT DEFAULT 0,                  -- Extra runs (wides, no-balls, etc.)
-    runs_total INT DEFAULT 0,                   -- Total runs from this delivery
-    
+    runs_batter SMALLINT DEFAULT 0,             -- Runs scored by batter
+    runs_extras SMALLINT DEFAULT 0,             -- Extra runs (wides, no-balls, etc.)
+    runs_total SMALLINT DEFAULT 0,              -- Total runs from this delivery
+
     -- Extras breakdown (for detailed analysis)
-    extras_wides INT DEFAULT 0,
-    extras_noballs INT DEFAULT 0,
-    extras_byes INT DEFAULT 0,
-    extras_legbyes INT DEFAULT 0,
-    extras_penalty INT DEFAULT 0,
-    
-    -- Wicket information
+    extras_wides SMALLINT DEFAULT 0,
+    extras_noballs SMALLINT DEFAULT 0,
+    extras_byes SMALLINT DEFAULT 0,
+    extras_legbyes SMALLINT DEFAULT 0,
+    extras_penalty SMALLINT DEFAULT 0,
+
+    -- Wicket flag and computed/derived fields for easier querying
     is_wicket BOOLEAN DEFAULT FALSE,            -- True if wicket fell
-    wicket_type TEXT,                           -- 'bowled', 'caught', 'lbw', 'run out', etc.
-    player_dismissed TEXT,                      -- Player who got out
-    fielder TEXT,                               -- Fielder involved (if applicable)
-    
-    -- Computed/derived fields for easier querying
     is_boundary BOOLEAN DEFAULT FALSE,          -- True if 4 or 6
     is_four BOOLEAN DEFAULT FALSE,              -- True if 4
     is_six BOOLEAN DEFAULT FALSE,               -- True if 6
     is_dot_ball BOOLEAN DEFAULT FALSE,          -- True if 0 runs (no extras)
     is_legal_delivery BOOLEAN DEFAULT TRUE,     -- False for wides/no-balls
-    
+
+    -- Teams and players
+    batting_team TEXT NOT NULL,                 -- Team batting
+    bowling_team TEXT NOT NULL,                 -- Team bowling
+    striker TEXT NOT NULL,                      -- Batter facing the ball
+    non_striker TEXT NOT NULL,                  -- Batter at non-striker end
+    bowler TEXT NOT NULL,                       -- Bowler delivering
+
+    -- Wicket details
+    wicket_type TEXT,                           -- 'bowled', 'caught', 'lbw', 'run out', etc.
+    player_dismissed TEXT,                      -- Player who got out
+    fielder TEXT,                               -- Fielder involved (if applicable)
+
     -- Phase classification for T20 analysis
-    phase TEXT,                                 -- 'powerplay', 'middle', 'death'
-    
-    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    phase TEXT                                  -- 'powerplay', 'middle', 'death'
 );
 
 -- Comprehensive indexes for analytics queries